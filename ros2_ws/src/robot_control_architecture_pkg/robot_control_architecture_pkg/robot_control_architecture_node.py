@@ -1,15 +1,89 @@
 import rclpy
 from rclpy.node import Node
-from rclpy.qos import qos_profile_sensor_data
+from rclpy.callback_groups import MutuallyExclusiveCallbackGroup
+from rclpy.executors import MultiThreadedExecutor
+from rclpy.qos import (
+    DurabilityPolicy,
+    HistoryPolicy,
+    QoSProfile,
+    ReliabilityPolicy,
+)
 from vision_msgs.msg import Detection2DArray
 from std_msgs.msg import String
-from rclpy.duration import Duration
-import random
+import ctypes
 import os
+import random
 import time
 from geometry_msgs.msg import Twist
 import math
 import subprocess
+import threading
+import queue
+
+try:
+    from numba import njit
+
+    HAVE_NUMBA = True
+except ImportError:  # run the kernel below as plain Python instead
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+
+INSTRUCTIONS = [
+    "Welcome to Red Light Green Light.",
+    "The rules are simple.",
+    "When you hear Green Light, you can move forward.",
+    "When you hear Red Light, you must freeze.",
+    "If you move during Red Light, you will be eliminated.",
+    "Reach the finish line to win.",
+    "You have 2 minutes to complete the game.",
+    "Get ready!",
+]
+
+# Every fixed phrase the node says; rendered to PCM once at startup
+SPEECH = INSTRUCTIONS + [
+    "3",
+    "2",
+    "1",
+    "Begin!",
+    "Time's up! Game Over!",
+    "Congratulations! You've won!",
+    "Movement detected! You're eliminated!",
+]
+
+# MobileNet-SSD (VOC) class id for "person"
+PERSON_CLASS_ID = "15"
+
+# All sound effects are decoded once to raw 16-bit mono PCM at this rate and
+# streamed into a single long-lived aplay process.
+AUDIO_RATE = 22050
+MPG123_DECODE = ["mpg123", "-q", "-s", "-m", "-r", str(AUDIO_RATE)]
+# espeak's native output is already 16-bit mono at 22050 Hz
+ESPEAK_RENDER = ["espeak", "-v", "en-us", "-s", "150", "--stdout"]
+APLAY_CMD = [
+    "aplay", "-q", "-t", "raw", "-f", "S16_LE", "-c", "1",
+    "-r", str(AUDIO_RATE), "-",
+]
+
+# Real-time settings applied in main(); see "Real-time scheduling" in README
+# One CPU per executor worker, so vision and control can run in parallel
+RT_CPUS = {2, 3}
+RT_PRIORITY = 80
+MCL_CURRENT = 1
+MCL_FUTURE = 2
+
+
+@njit(cache=True, fastmath=True)
+def _moved(px, py, psx, psy, cx, cy, csx, csy, thr):
+    """True if any bounding-box coordinate changed by more than thr"""
+    return (
+        abs(cx - px) > thr
+        or abs(cy - py) > thr
+        or abs(csx - psx) > thr
+        or abs(csy - psy) > thr
+    )
 
 
 class SquidGameNode(Node):
@@ -20,92 +94,241 @@ class SquidGameNode(Node):
         self.time_limit = 120.0
         self.elapsed_time = 0.0
         self.game_start_time = None
+        self._limit_timer = None
 
         self.current_light_duration = 0.0
-        self.light_end_time = None
+        # time.monotonic() seconds; a light only starts once its clip has
+        # been heard, and ends current_light_duration after that.
+        self._light_start = 0.0
+        self._light_deadline = 0.0
 
         self.movement_threshold = 10.0
         self.size_y_finish_line = 400.0
         self.player_reached_finish_line = False
         self.player_moved = False
         self.rotation_speed = 1.0
-
-        self.previous_detection = None
-        self.current_detection = None
+        self._rot_end = 0.0
+        self._rot_twist = Twist()
+        self._rot_twist.angular.z = self.rotation_speed
+        self._stop_twist = Twist()
+
+        # Detections arrive on an executor thread separate from main_loop;
+        # this lock guards the fields shared between the two.
+        self._detection_lock = threading.Lock()
+        # Previous red-light person box as an (x, y, size_x, size_y) tuple
+        self._prev_feat = None
+        if not HAVE_NUMBA:
+            self.get_logger().warning(
+                "numba not found; movement check runs as plain Python."
+            )
+        # Compile the movement kernel now rather than on the first red light
+        _moved(0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0)
 
         self.random_interval_min = 0.8
         self.random_interval_max = 1.2
 
+        # Speech is played from the aplay pipe; the instruction and countdown
+        # states poll when the queued audio ends instead of blocking.
+        self._audio_end = 0.0  # time.monotonic() when queued audio finishes
+        self._instruction_idx = 0
+        self._countdown = 3
+
+        self._green_pcm = self.decode_audio("green_light.mp3")
+        self._red_pcm = self.decode_audio("red_light.mp3")
+        self._lose_pcm = self.decode_audio("lose.mp3")
+        self._tts_cache = {text: self.render_speech(text) for text in SPEECH}
+        try:
+            self._aplay = subprocess.Popen(
+                APLAY_CMD,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                close_fds=False,
+            )
+        except OSError as e:
+            self._aplay = None
+            self.get_logger().error(f"Audio output error: {str(e)}")
+        self._audio_queue = queue.Queue()
+        self._audio_thread = threading.Thread(
+            target=self._audio_worker, daemon=True
+        )
+        self._audio_thread.start()
+
+        # Separate groups so vision and control run in parallel; each group
+        # is mutually exclusive so frames are handled one at a time, in order.
+        self._vision_cbg = MutuallyExclusiveCallbackGroup()
+        self._control_cbg = MutuallyExclusiveCallbackGroup()
+
+        # Only the newest frame matters: if the callback falls behind, let
+        # the middleware drop old detections instead of queueing them.
+        detection_qos = QoSProfile(
+            history=HistoryPolicy.KEEP_LAST,
+            depth=1,
+            reliability=ReliabilityPolicy.BEST_EFFORT,
+            durability=DurabilityPolicy.VOLATILE,
+        )
         self.detection_sub = self.create_subscription(
             Detection2DArray,
             "/color/mobilenet_detections",
             self.detection_callback,
-            qos_profile_sensor_data,
+            detection_qos,
+            callback_group=self._vision_cbg,
+        )
+
+        # detection_callback raises player events through this guard
+        # condition so the state change (and any timer swap) happens in the
+        # control group rather than on the vision thread.
+        self._player_event = self.create_guard_condition(
+            self.on_player_event, callback_group=self._control_cbg
         )
 
         self.state_pub = self.create_publisher(String, "game_state", 10)
-        self.timer = self.create_timer(0.1, self.main_loop)
+        self._state_msg = String()
+        self._dispatch = {
+            "INSTRUCTIONS": self.instructions_state,
+            "ROTATING_PRE_COUNTDOWN": self.rotating_pre_countdown_state,
+            "COUNTDOWN": self.countdown_state,
+            "INIT": self.init_state,
+            "ROTATING_GAME_OVER": self.rotating_game_over_state,
+            "GAME_OVER": self.game_over_state,
+        }
+        # The control timer is swapped per state: main_loop polls at 10 Hz
+        # while speaking or rotating, and during the lights a one-shot timer
+        # fires at the light's deadline instead. Only callbacks in
+        # _control_cbg create or destroy it.
+        self.timer = None
+        self.resume_main_loop()
         self.get_logger().info("Squid Game Node Initialized.")
 
     def speak_text(self, text):
-        """Use espeak for text-to-speech"""
+        """Queue pre-rendered speech; returns immediately"""
+        # Count pauses from now even if nothing ends up queued (no espeak
+        # or aplay), so the instruction and countdown pacing still holds.
+        self._audio_end = max(self._audio_end, time.monotonic())
+        # Phrases are only rendered in __init__, before main() switches to
+        # real-time scheduling, so espeak never inherits SCHED_FIFO.
+        pcm = self._tts_cache.get(text)
+        if pcm is None:
+            self.get_logger().error(f"TTS error: '{text}' is not in SPEECH")
+            return
+        self.play_audio(pcm)
+
+    def render_speech(self, text):
+        """Synthesise text with espeak to raw PCM for the aplay pipe"""
         try:
-            subprocess.run(["espeak", "-v", "en-us", "-s", "150", text])
-        except Exception as e:
+            wav = subprocess.check_output(
+                ESPEAK_RENDER + [text],
+                stdin=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                close_fds=False,
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
             self.get_logger().error(f"TTS error: {str(e)}")
+            return b""
+        data = wav.find(b"data")
+        if data < 0:
+            self.get_logger().error(f"TTS error: no audio for '{text}'")
+            return b""
+        return wav[data + 8:]
+
+    def decode_audio(self, path):
+        """Decode an mp3 file to raw PCM for the aplay pipe"""
+        try:
+            return subprocess.check_output(
+                MPG123_DECODE + [path],
+                stdin=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                close_fds=False,
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
+            self.get_logger().error(f"Audio decode error ({path}): {str(e)}")
+            return b""
+
+    def play_audio(self, pcm):
+        """Queue PCM for playback; returns immediately"""
+        if pcm and self._aplay is not None:
+            start = max(time.monotonic(), self._audio_end)
+            self._audio_end = start + len(pcm) / (2 * AUDIO_RATE)
+            self._audio_queue.put(pcm)
+
+    def _audio_worker(self):
+        while True:
+            pcm = self._audio_queue.get()
+            if pcm is None:
+                return
+            try:
+                self._aplay.stdin.write(pcm)
+                self._aplay.stdin.flush()
+            except (OSError, ValueError) as e:
+                self.get_logger().error(f"Audio playback error: {str(e)}")
+                return
+
+    def _tts_ready(self, pause):
+        """True once the queued audio has finished and `pause` s have passed"""
+        return time.monotonic() >= self._audio_end + pause
+
+    def _schedule(self, period, callback):
+        """Replace the control timer with one calling `callback` every `period` s"""
+        if self.timer is not None:
+            self.destroy_timer(self.timer)
+        self.timer = self.create_timer(
+            period, callback, callback_group=self._control_cbg
+        )
+
+    def resume_main_loop(self):
+        self._schedule(0.1, self.main_loop)
 
     def main_loop(self):
-        if self.state == "INSTRUCTIONS":
-            self.instructions_state()
-        elif self.state == "COUNTDOWN":
-            self.countdown_state()
-        elif self.state == "INIT":
-            self.init_state()
-        elif self.state == "GREEN_LIGHT":
-            self.green_light_state()
-        elif self.state == "RED_LIGHT":
-            self.red_light_state()
-        elif self.state == "GAME_OVER":
-            self.game_over_state()
-        else:
-            self.get_logger().error(f"Unknown state: {self.state}")
+        self._dispatch.get(self.state, self.unknown_state)()
+
+    def unknown_state(self):
+        self.get_logger().error(f"Unknown state: {self.state}")
 
     def instructions_state(self):
-        """Play game instructions using TTS"""
-        instructions = [
-            "Welcome to Red Light Green Light.",
-            "The rules are simple.",
-            "When you hear Green Light, you can move forward.",
-            "When you hear Red Light, you must freeze.",
-            "If you move during Red Light, you will be eliminated.",
-            "Reach the finish line to win.",
-            "You have 2 minutes to complete the game.",
-            "Get ready!",
-        ]
-
-        for instruction in instructions:
-            self.speak_text(instruction)
-            time.sleep(0.5)  # Pause between sentences
-
-        self.perform_180_rotation()
+        """Play game instructions using TTS, one sentence per tick"""
+        if not self._tts_ready(0.5):  # Pause between sentences
+            return
+
+        if self._instruction_idx < len(INSTRUCTIONS):
+            self.speak_text(INSTRUCTIONS[self._instruction_idx])
+            self._instruction_idx += 1
+            return
+
+        self.start_180_rotation("ROTATING_PRE_COUNTDOWN")
+
+    def rotating_pre_countdown_state(self):
+        if not self.rotation_step():
+            return
 
         self.state = "COUNTDOWN"
         self.get_logger().info("Instructions completed, starting countdown.")
 
     def countdown_state(self):
         """Countdown from 3 before starting the game"""
-        for count in range(3, 0, -1):
-            self.speak_text(str(count))
-            time.sleep(1)
+        if self._countdown < 0:
+            # "Begin!" is queued; start the game once it has been heard
+            if not self._tts_ready(0.0):
+                return
+            self.state = "INIT"
+            self.get_logger().info("Countdown completed, starting game.")
+            return
 
-        self.speak_text("Begin!")
-        self.state = "INIT"
-        self.get_logger().info("Countdown completed, starting game.")
+        if not self._tts_ready(1.0):
+            return
+
+        if self._countdown > 0:
+            self.speak_text(str(self._countdown))
+        else:
+            self.speak_text("Begin!")
+        self._countdown -= 1
 
     def init_state(self):
         self.get_logger().info("Game Starting.")
         self.game_start_time = self.get_clock().now()
         self.elapsed_time = 0.0
+        self._limit_timer = self.create_timer(
+            1.0, self.check_time_limit, callback_group=self._control_cbg
+        )
         self.start_random_light()
 
     def start_random_light(self):
@@ -119,13 +342,13 @@ class SquidGameNode(Node):
             self.start_red_light()
         elif self.state == "RED_LIGHT":
             # Randomly choose next light after red
-            if random.choice([True, False]):
+            if random.getrandbits(1):
                 self.start_green_light()
             else:
                 self.start_red_light()
         else:
             # Initial state - randomly choose first light
-            if random.choice([True, False]):
+            if random.getrandbits(1):
                 self.start_green_light()
             else:
                 self.start_red_light()
@@ -135,87 +358,127 @@ class SquidGameNode(Node):
         self.current_light_duration = random.uniform(
             self.random_interval_min, self.random_interval_max
         )
-        duration = Duration(seconds=self.current_light_duration)
-        self.light_end_time = self.get_clock().now() + duration
-        os.system("mpg123 green_light.mp3")
+        self.play_audio(self._green_pcm)
+        self._start_light_timer()
         self.get_logger().info(
             f"GREEN_LIGHT state for {self.current_light_duration:.2f} seconds."
         )
         self.publish_state("GREEN_LIGHT")
+        # The player may already have crossed the line during a red light
+        self.green_light_state()
 
     def green_light_state(self):
-        now = self.get_clock().now()
-        self.elapsed_time = (now - self.game_start_time).nanoseconds / 1e9
+        with self._detection_lock:
+            reached_finish_line = self.player_reached_finish_line
 
-        if self.elapsed_time >= self.time_limit:
-            self.speak_text("Time's up! Game Over!")
-            self.get_logger().info("Time limit reached. Player loses.")
-            self.state = "GAME_OVER"
-            self.game_result = "LOSE"
-            return
-
-        if self.player_reached_finish_line:
+        if reached_finish_line:
             self.speak_text("Congratulations! You've won!")
             self.get_logger().info("Player reached finish line. Player wins!")
             self.state = "GAME_OVER"
             self.game_result = "WIN"
-            return
-
-        if now >= self.light_end_time:
-            self.start_random_light()
+            self.resume_main_loop()
 
     def start_red_light(self):
-        self.state = "RED_LIGHT"
         self.current_light_duration = random.uniform(
             self.random_interval_min, self.random_interval_max
         )
-        duration = Duration(seconds=self.current_light_duration)
-        self.light_end_time = self.get_clock().now() + duration
-        os.system("mpg123 red_light.mp3")
+        # Reset movement tracking and move _light_start forward before the
+        # vision thread can see RED_LIGHT, so no frame is compared against
+        # a box left over from the previous red light.
+        with self._detection_lock:
+            self._prev_feat = None
+            self.player_moved = False
+        self.play_audio(self._red_pcm)
+        self._start_light_timer()
+        self.state = "RED_LIGHT"
         self.get_logger().info(
             f"RED_LIGHT state for {self.current_light_duration:.2f} seconds."
         )
-        self.previous_detection = None
-        self.player_moved = False
         self.publish_state("RED_LIGHT")
 
+    def _start_light_timer(self):
+        """Arm the light's deadline, counted from the end of its clip"""
+        self._light_start = max(time.monotonic(), self._audio_end)
+        self._light_deadline = self._light_start + self.current_light_duration
+        self._schedule(
+            self._light_deadline - time.monotonic(), self.on_light_expire
+        )
+
     def red_light_state(self):
+        with self._detection_lock:
+            player_moved = self.player_moved
+
+        if player_moved:
+            self.start_180_rotation("ROTATING_GAME_OVER")
+            self.resume_main_loop()
+
+    def on_light_expire(self):
+        # A timer replaced after the executor picked it up can still fire once
+        if self.state not in ("GREEN_LIGHT", "RED_LIGHT"):
+            return
+
+        remaining = self._light_deadline - time.monotonic()
+        if remaining > 0.0:
+            self._schedule(remaining, self.on_light_expire)
+            return
+
+        # rclpy runs ready timers before guard conditions, so a movement
+        # raised just before the deadline may not have been handled yet.
+        if self.state == "RED_LIGHT":
+            self.red_light_state()
+            if self.state != "RED_LIGHT":
+                return
+
+        self.start_random_light()
+
+    def on_player_event(self):
+        """Guard-condition callback for a flag raised in detection_callback"""
+        state = self.state
+        if state == "GREEN_LIGHT":
+            self.green_light_state()
+        elif state == "RED_LIGHT":
+            self.red_light_state()
+
+    def check_time_limit(self):
+        if self.state not in ("GREEN_LIGHT", "RED_LIGHT"):
+            return
+
         now = self.get_clock().now()
-        self.elapsed_time = (now - self.game_start_time).nanoseconds / 1e9
+        elapsed_time = (now - self.game_start_time).nanoseconds / 1e9
+        self.elapsed_time = elapsed_time
 
-        if self.elapsed_time >= self.time_limit:
+        if elapsed_time >= self.time_limit:
             self.speak_text("Time's up! Game Over!")
             self.get_logger().info("Time limit reached. Player loses.")
             self.state = "GAME_OVER"
             self.game_result = "LOSE"
-            return
+            self.resume_main_loop()
 
-        if self.player_moved:
-            self.perform_180_rotation()
-            os.system("mpg123 lose.mp3")
-            self.speak_text("Movement detected! You're eliminated!")
-            self.get_logger().info("Player moved during RED_LIGHT. Player loses.")
-            self.state = "GAME_OVER"
-            self.game_result = "LOSE"
+    def rotating_game_over_state(self):
+        if not self.rotation_step():
             return
 
-        if now >= self.light_end_time:
-            self.start_random_light()
-
-    def perform_180_rotation(self):
-        rotation_duration = math.pi / self.rotation_speed
-        start_time = time.time()
-
-        while time.time() < start_time + rotation_duration:
-            vel_msg = Twist()
-            vel_msg.angular.z = self.rotation_speed
-            self.vel_pub.publish(vel_msg)
-            time.sleep(0.1)
-
-        vel_msg = Twist()
-        vel_msg.angular.z = 0.0
-        self.vel_pub.publish(vel_msg)
+        self.play_audio(self._lose_pcm)
+        self.speak_text("Movement detected! You're eliminated!")
+        self.get_logger().info("Player moved during RED_LIGHT. Player loses.")
+        self.state = "GAME_OVER"
+        self.game_result = "LOSE"
+
+    def start_180_rotation(self, rotating_state):
+        """Enter `rotating_state`; main_loop drives the turn via rotation_step"""
+        self.state = rotating_state
+        self._rot_end = time.time() + math.pi / self.rotation_speed
+        self.vel_pub.publish(self._rot_twist)
+
+    def rotation_step(self):
+        """Publish one rotation tick; return True once the turn is complete"""
+        if time.time() < self._rot_end:
+            self.vel_pub.publish(self._rot_twist)
+            return False
+
+        self.vel_pub.publish(self._stop_twist)
         self.get_logger().info("180-degree rotation completed.")
+        return True
 
     def game_over_state(self):
         if self.game_result == "WIN":
@@ -224,68 +487,120 @@ class SquidGameNode(Node):
             self.get_logger().info("Game Over: Player Loses.")
         self.publish_state("GAME_OVER")
         self.timer.cancel()
+        if self._limit_timer is not None:
+            self._limit_timer.cancel()
 
     def detection_callback(self, msg):
-        person_detected = False
+        # Detections only affect the game while a light is showing
+        state = self.state
+        if state not in ("GREEN_LIGHT", "RED_LIGHT"):
+            return
+
+        target = PERSON_CLASS_ID
         max_size_y = 0.0
-        detection = None
+        best = None
 
+        # Keep the tallest person box; boxes that cannot beat the current
+        # best are skipped before their results are looked at.
         for det in msg.detections:
+            bbox = det.bbox
+            size_y = bbox.size_y
+            if size_y <= max_size_y:
+                continue
             for result in det.results:
-                if result.hypothesis.class_id == "15":
-                    bbox = det.bbox
-                    size_y = bbox.size_y
-                    if size_y > max_size_y:
-                        person_detected = True
-                        detection = det
-                        max_size_y = size_y
-
-        if person_detected:
-            self.current_detection = detection
-            if self.current_detection.bbox.size_y >= self.size_y_finish_line:
-                self.player_reached_finish_line = True
+                if result.hypothesis.class_id == target:
+                    max_size_y = size_y
+                    best = bbox
+                    break
 
-            if self.state == "RED_LIGHT":
-                if self.previous_detection is not None:
-                    moved = self.detect_movement(
-                        self.previous_detection, self.current_detection
+        if best is None:
+            return
+
+        position = best.center.position
+        feat = (position.x, position.y, best.size_x, best.size_y)
+
+        # Finish-line and movement checks both work off this one tuple
+        raised = False
+        with self._detection_lock:
+            if (
+                feat[3] >= self.size_y_finish_line
+                and not self.player_reached_finish_line
+            ):
+                self.player_reached_finish_line = True
+                raised = True
+
+            # Movement only matters under a red light once the player has
+            # heard it, and start_red_light clears _prev_feat, so it is not
+            # tracked during green.
+            heard = time.monotonic() >= self._light_start
+            if state == "RED_LIGHT" and heard:
+                prev_feat = self._prev_feat
+                if prev_feat is not None and _moved(
+                    *prev_feat, *feat, self.movement_threshold
+                ):
+                    delta = [abs(c - p) for p, c in zip(prev_feat, feat)]
+                    self.get_logger().info(
+                        "Movement detected: delta_x={}, delta_y={}, "
+                        "delta_size_x={}, delta_size_y={}".format(*delta)
                     )
-                    if moved:
+                    if not self.player_moved:
                         self.player_moved = True
+                        raised = True
+                self._prev_feat = feat
 
-            self.previous_detection = self.current_detection
-
-    def detect_movement(self, prev_det, curr_det):
-        prev_bbox = prev_det.bbox
-        curr_bbox = curr_det.bbox
-
-        delta_x = abs(curr_bbox.center.position.x - prev_bbox.center.position.x)
-        delta_y = abs(curr_bbox.center.position.y - prev_bbox.center.position.y)
-        delta_size_x = abs(curr_bbox.size_x - prev_bbox.size_x)
-        delta_size_y = abs(curr_bbox.size_y - prev_bbox.size_y)
-
-        if (
-            delta_x > self.movement_threshold
-            or delta_y > self.movement_threshold
-            or delta_size_x > self.movement_threshold
-            or delta_size_y > self.movement_threshold
-        ):
-            self.get_logger().info(
-                f"Movement detected: delta_x={delta_x}, delta_y={delta_y}, delta_size_x={delta_size_x}, delta_size_y={delta_size_y}"
-            )
-            return True
-        return False
+        if raised:
+            self._player_event.trigger()
 
     def publish_state(self, state):
-        msg = String()
-        msg.data = state
-        self.state_pub.publish(msg)
+        self._state_msg.data = state
+        self.state_pub.publish(self._state_msg)
+
+    def destroy_node(self):
+        self._audio_queue.put(None)
+        if self._aplay is not None:
+            self._audio_thread.join(timeout=1.0)
+            self._aplay.stdin.close()
+            self._aplay.terminate()
+        super().destroy_node()
+
+
+def enable_realtime(logger):
+    """Pin to RT_CPUS, switch to SCHED_FIFO and lock memory (best effort)
+
+    Only the calling thread and threads/processes it starts afterwards are
+    affected, so call this once the node's audio helpers are running. The
+    executor's worker threads start later and share RT_CPUS at the same
+    priority; with fewer CPUs than workers, they take turns instead of
+    running in parallel, since equal SCHED_FIFO threads never preempt.
+    """
+    try:
+        os.sched_setaffinity(0, RT_CPUS)
+    except OSError as e:
+        logger.warning(f"Could not pin to CPUs {sorted(RT_CPUS)}: {str(e)}")
+
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(RT_PRIORITY))
+    except OSError as e:
+        logger.warning(f"Could not enable SCHED_FIFO: {str(e)}")
+
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.mlockall(MCL_CURRENT | MCL_FUTURE) != 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+    except (OSError, AttributeError) as e:
+        logger.warning(f"Could not lock memory: {str(e)}")
 
 
 def main(args=None):
     rclpy.init(args=args)
+    # The node spawns mpg123, espeak and aplay while it is constructed; keep
+    # those (and the audio writer thread) on the default scheduler and CPUs.
     squid_game_node = SquidGameNode()
-    rclpy.spin(squid_game_node)
+    enable_realtime(squid_game_node.get_logger())
+    executor = MultiThreadedExecutor(num_threads=2)
+    executor.add_node(squid_game_node)
+    executor.spin()
     squid_game_node.destroy_node()
     rclpy.shutdown()
 
@@ -0,0 +1,33 @@
+import time
+
+import pytest
+import rclpy
+
+from robot_control_architecture_pkg import robot_control_architecture_node as node_mod
+
+
+@pytest.fixture
+def node(monkeypatch):
+    def no_audio(*args, **kwargs):
+        raise OSError("audio disabled in tests")
+
+    monkeypatch.setattr(node_mod.subprocess, "check_output", no_audio)
+    monkeypatch.setattr(node_mod.subprocess, "Popen", no_audio)
+    rclpy.init()
+    squid_game_node = node_mod.SquidGameNode()
+    yield squid_game_node
+    squid_game_node.destroy_node()
+    rclpy.shutdown()
+
+
+def test_light_expire_handles_pending_movement(node):
+    # A frame raised player_moved, but the light timer runs before the
+    # guard-condition callback.
+    node.state = "RED_LIGHT"
+    node.player_moved = True
+    node._light_deadline = time.monotonic() - 0.1
+
+    node.on_light_expire()
+    node.on_player_event()
+
+    assert node.state == "ROTATING_GAME_OVER"